@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Iterable, List
+from typing import List, Optional, Tuple
 
 import cdsapi
+from requests.exceptions import HTTPError
 
 # Ajuste aqui valores padrão que serão usados caso nenhum argumento seja passado.
 DATASET = "projections-cmip6"
@@ -18,9 +22,20 @@ DEFAULT_EXPERIMENTS = ["historical", "ssp1_2_6", "ssp5_8_5"]
 HIST_RANGE = (1980, 2014)
 SCENARIO_RANGE = (2015, 2049)
 BASE_OUTPUT = Path("date")
-
-MONTHS = [f"{m:02d}" for m in range(1, 13)]
-DAYS = [f"{d:02d}" for d in range(1, 32)]
+# Pedidos simultâneos ao CDS: o tempo é quase todo espera na fila do servidor,
+# então sobrepor poucos pedidos acelera sem violar o uso justo.
+MAX_WORKERS = 4
+MAX_RETRIES = 3
+RETRY_BACKOFF = 30.0  # segundos; dobra a cada nova tentativa
+
+MONTHS = tuple(f"{m:02d}" for m in range(1, 13))
+DAYS = tuple(f"{d:02d}" for d in range(1, 32))
+# Campos fixos compartilhados por todos os pedidos; build_request só copia e sobrescreve.
+REQUEST_TEMPLATE = {
+    "temporal_resolution": "daily",
+    "month": MONTHS,
+    "day": DAYS,
+}
 
 
 def year_list(start: int, end: int) -> List[str]:
@@ -36,20 +51,31 @@ def output_dir_for_experiment(base_dir: Path, experiment: str) -> Path:
 def build_request(
     variable: str,
     experiment: str,
-    years: Iterable[str],
-    area: Iterable[float],
+    years: List[str],
+    area: List[float],
     model: str,
 ) -> dict:
-    return {
-        "temporal_resolution": "daily",
-        "experiment": experiment,
-        "variable": variable,
-        "model": model,
-        "year": list(years),
-        "month": MONTHS,
-        "day": DAYS,
-        "area": list(area),
-    }
+    request = REQUEST_TEMPLATE.copy()
+    request.update(
+        experiment=experiment,
+        variable=variable,
+        model=model,
+        year=years,
+        area=area,
+    )
+    return request
+
+
+_thread_local = threading.local()
+
+
+def get_client() -> cdsapi.Client:
+    # cdsapi.Client não é thread-safe: um cliente por thread de download.
+    client = getattr(_thread_local, "client", None)
+    if client is None:
+        client = cdsapi.Client()
+        _thread_local.client = client
+    return client
 
 
 def download_one(
@@ -57,7 +83,7 @@ def download_one(
     variable: str,
     experiment: str,
     years: List[str],
-    area: Iterable[float],
+    area: List[float],
     model: str,
     target_dir: Path,
 ) -> Path:
@@ -67,6 +93,44 @@ def download_one(
     return target_file
 
 
+def is_retryable(status: Optional[int]) -> bool:
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def download_task(
+    variable: str,
+    experiment: str,
+    years: List[str],
+    area: List[float],
+    model: str,
+    target_dir: Path,
+    retries: int = MAX_RETRIES,
+    backoff: float = RETRY_BACKOFF,
+) -> Path:
+    attempt = 0
+    while True:
+        try:
+            return download_one(
+                client=get_client(),
+                variable=variable,
+                experiment=experiment,
+                years=years,
+                area=area,
+                model=model,
+                target_dir=target_dir,
+            )
+        except HTTPError as exc:
+            # Só 429 (limite de pedidos) e 5xx são transitórios; demais 4xx
+            # (pedido inválido, credenciais, licença) falham na hora.
+            status = getattr(exc.response, "status_code", None)
+            if not is_retryable(status) or attempt >= retries:
+                raise
+            wait = backoff * 2**attempt
+            print(f"[aviso] {experiment} {variable}: HTTP {status}, nova tentativa em {wait:.0f}s")
+            time.sleep(wait)
+            attempt += 1
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Baixa dados CMIP6 (histórico e projeções) via CDS API."
@@ -127,32 +191,56 @@ def parse_args() -> argparse.Namespace:
         default=str(BASE_OUTPUT),
         help="Diretório base para salvar arquivos (historico/projecao).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help="Número de pedidos simultâneos ao CDS.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    client = cdsapi.Client()
 
     hist_years = year_list(args.historical_start, args.historical_end)
     scenario_years = year_list(args.scenario_start, args.scenario_end)
     base_dir = Path(args.output_base)
 
+    jobs: List[Tuple[str, str, List[str], Path]] = []
     for experiment in args.experiments:
         years = hist_years if experiment == "historical" else scenario_years
         target_dir = output_dir_for_experiment(base_dir, experiment)
         for variable in args.variables:
-            target_file = download_one(
-                client=client,
+            jobs.append((experiment, variable, years, target_dir))
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {
+            executor.submit(
+                download_task,
                 variable=variable,
                 experiment=experiment,
                 years=years,
                 area=args.area,
                 model=args.model,
                 target_dir=target_dir,
-            )
+            ): (experiment, variable)
+            for experiment, variable, years, target_dir in jobs
+        }
+        for future in as_completed(futures):
+            experiment, variable = futures[future]
+            try:
+                target_file = future.result()
+            except Exception as exc:
+                failures += 1
+                print(f"[erro] {experiment} {variable}: {exc}")
+                continue
             print(f"[ok] {experiment} {variable} -> {target_file}")
 
+    if failures:
+        raise SystemExit(f"{failures} download(s) falharam.")
+
 
 if __name__ == "__main__":
     main()
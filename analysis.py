@@ -1,17 +1,55 @@
 from __future__ import annotations
 
 import argparse
+import io
+import os
+import shutil
 import tempfile
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import xarray as xr
+from matplotlib.figure import Figure
+
+try:
+    import netCDF4
+except ImportError:  # netCDF4 é opcional; sem ele o xarray escolhe o engine
+    netCDF4 = None
+
+try:
+    from xarray.coders import CFDatetimeCoder
+except ImportError:  # xarray < 2025.01
+    DECODE_KWARGS = {"decode_times": True, "use_cftime": False}
+else:
+    DECODE_KWARGS = {"decode_times": CFDatetimeCoder(use_cftime=False)}
 
 DEFAULT_VARIABLE = "near_surface_air_temperature"
 DEFAULT_EXPERIMENTS = ["ssp1_2_6", "ssp5_8_5"]
+# Leitura preguiçosa (dask) em blocos de ~1 ano de dados diários: a média
+# espacial é calculada bloco a bloco sem materializar o cubo inteiro.
+TIME_CHUNKS = {"time": 365}
+# Cache de chunks da libnetcdf (global, vale para os arquivos abertos depois).
+# 256 MiB por variável aberta trocam memória por menos releituras/descompressões
+# de chunks nas médias lat/lon de arquivos diários grandes.
+NETCDF_CHUNK_CACHE = {"size": 256 * 1024 * 1024, "nelems": 4133, "preemption": 0.75}
+if netCDF4 is not None:
+    netCDF4.set_chunk_cache(**NETCDF_CHUNK_CACHE)
+MAX_LOAD_WORKERS = 4  # arquivos de cenário lidos em paralelo
+# .nc dentro de .zip até IN_MEMORY_ZIP_LIMIT é lido inteiro para memória. Como
+# até MAX_LOAD_WORKERS arquivos são abertos ao mesmo tempo, o orçamento total é
+# dividido entre eles; membros maiores vão para um temporário em disco.
+IN_MEMORY_ZIP_BUDGET = 1024 * 1024 * 1024
+IN_MEMORY_ZIP_LIMIT = IN_MEMORY_ZIP_BUDGET // MAX_LOAD_WORKERS
+# Tempo decodificado direto para datetime64 (sem objetos cftime em Python puro).
+# Calendários não-padrão (ex.: noleap) falham nesse caminho e são reabertos
+# com a decodificação padrão (cftime), ver open_with_time_fallback.
+CFTIME_OPEN_KWARGS = {"chunks": TIME_CHUNKS, "mask_and_scale": True}
+OPEN_KWARGS = {**CFTIME_OPEN_KWARGS, **DECODE_KWARGS}
+ZARR_CACHE_MARKER = "_cache_completo"  # atributo gravado por último no .zarr
 BASE_DIR = Path("date")
 OUTPUT_DIR = Path("img")
 ALIASES = {
@@ -28,6 +66,9 @@ COLORS = {
     "ssp1_2_6": "green",
     "ssp5_8_5": "orange",
 }
+MONTHS = np.arange(1, 13)
+LATLON_DIMS_ATTR = "_latlon_dims"  # cache das dimensões lat/lon de um DataArray
+N_DIRECTION_BINS = 16  # setores da rosa dos ventos (22,5° cada)
 AGG_METHODS = {
     # Para variáveis acumulativas, use soma; demais, média.
     "total_precipitation": "sum",
@@ -37,35 +78,116 @@ AGG_METHODS = {
 }
 
 
+def zarr_cache_path(path: Path) -> Path:
+    # Nome completo (foo.nc.zarr / foo.zip.zarr): .nc e .zip irmãos não colidem.
+    if path.suffix.lower() == ".zarr":
+        return path
+    return path.with_name(path.name + ".zarr")
+
+
+def cache_is_fresh(cache: Path, source: Path) -> bool:
+    return cache.exists() and cache.stat().st_mtime >= source.stat().st_mtime
+
+
+def write_zarr_cache(ds: xr.Dataset, cache: Path, source: Path) -> bool:
+    # Grava num diretório temporário irmão e só move para o lugar final quando
+    # completo; o atributo marcador é o último item gravado.
+    tmp: Optional[Path] = None
+    try:
+        tmp = Path(tempfile.mkdtemp(prefix=f".{cache.name}.", dir=cache.parent))
+        ds.to_zarr(tmp, mode="w", consolidated=False)
+        marker = xr.Dataset(attrs={**ds.attrs, ZARR_CACHE_MARKER: 1})
+        marker.to_zarr(tmp, mode="a", consolidated=False)
+        if not cache_is_fresh(cache, source):  # outra execução pode ter gravado antes
+            shutil.rmtree(cache, ignore_errors=True)
+            os.replace(tmp, cache)
+    except Exception as exc:  # zarr ausente, disco cheio, gravação concorrente...
+        print(f"[aviso] Cache Zarr não gravado ({cache.name}): {exc}")
+        return False
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return True
+
+
+def open_with_time_fallback(opener, target, **kwargs) -> xr.Dataset:
+    try:
+        return opener(target, **kwargs, **OPEN_KWARGS)
+    except ValueError as exc:
+        # Só a falha de decodificação do tempo (calendário não-padrão ou datas
+        # fora do alcance do datetime64) justifica reabrir; o resto propaga.
+        if "unable to decode time" not in str(exc):
+            raise
+        if hasattr(target, "seek"):
+            target.seek(0)
+        return opener(target, **kwargs, **CFTIME_OPEN_KWARGS)
+
+
+def open_zarr_cache(cache: Path) -> xr.Dataset:
+    ds = open_with_time_fallback(xr.open_zarr, cache, consolidated=False)
+    if ds.attrs.pop(ZARR_CACHE_MARKER, None) is None:
+        ds.close()
+        raise ValueError("gravação incompleta (marcador ausente)")
+    return ds
+
+
+def open_source_dataset(path: Path, stack: ExitStack) -> xr.Dataset:
+    if path.suffix.lower() == ".zip":
+        import zipfile
+
+        zf = stack.enter_context(zipfile.ZipFile(path, "r"))
+        members = [m for m in zf.infolist() if m.filename.endswith(".nc")]
+        if not members:
+            raise FileNotFoundError(f"Nenhum .nc dentro do zip: {path}")
+        member = members[0]
+        # .nc pequenos vão inteiros para memória. Grandes sem compressão são
+        # lidos em fluxo do zip; grandes comprimidos (caso do CDS) são extraídos
+        # para um temporário, pois cada seek para trás no fluxo deflate
+        # recomeçaria a descompressão do início do membro.
+        if member.file_size <= IN_MEMORY_ZIP_LIMIT:
+            fh = io.BytesIO(zf.read(member))
+        elif member.compress_type == zipfile.ZIP_STORED:
+            fh = stack.enter_context(zf.open(member))
+        else:
+            td = stack.enter_context(tempfile.TemporaryDirectory())
+            return open_netcdf_path(Path(zf.extract(member, td)))
+        # Sem engine fixo: o xarray detecta NetCDF4/HDF5 ou NetCDF3 pelos bytes iniciais.
+        return open_with_time_fallback(xr.open_dataset, fh)
+    return open_netcdf_path(path)
+
+
+def open_netcdf_path(path: Path) -> xr.Dataset:
+    engine = "netcdf4" if netCDF4 is not None else None
+    return open_with_time_fallback(xr.open_dataset, path, engine=engine)
+
+
 @contextmanager
-def open_dataset_maybe_zip(path: Path):
+def open_dataset_maybe_zip(path: Path, cache: bool = True):
     """
     Abre um arquivo NetCDF diretamente ou dentro de um .zip.
-    Garante limpeza do temporário ao sair do contexto.
+    No caso do .zip, o NetCDF é lido da memória, em fluxo ou de um temporário.
+    Com cache=True, a primeira leitura grava uma cópia Zarr (já decodificada)
+    ao lado do arquivo; as seguintes abrem o Zarr enquanto ele for mais novo
+    que a origem.
     """
-    if path.suffix.lower() == ".zip":
-        import zipfile
-
-        with tempfile.TemporaryDirectory() as td:
-            with zipfile.ZipFile(path, "r") as zf:
-                members = [m for m in zf.namelist() if m.endswith(".nc")]
-                if not members:
-                    raise FileNotFoundError(f"Nenhum .nc dentro do zip: {path}")
-                member = members[0]
-                zf.extract(member, td)
-            nc_path = Path(td) / member
-            ds = xr.open_dataset(nc_path)
+    with ExitStack() as stack:
+        cache_path = zarr_cache_path(path)
+        ds: Optional[xr.Dataset] = None
+        if cache and cache_is_fresh(cache_path, path):
             try:
-                yield ds
-            finally:
+                ds = open_zarr_cache(cache_path)
+            except Exception as exc:  # cache corrompido: descarta e relê a origem
+                print(f"[aviso] Cache Zarr inválido ({cache_path.name}), relendo origem: {exc}")
+                shutil.rmtree(cache_path, ignore_errors=True)
+        if ds is None:
+            ds = open_source_dataset(path, stack)
+            if cache and write_zarr_cache(ds, cache_path, path):
                 ds.close()
-            return
-
-    ds = xr.open_dataset(path)
-    try:
-        yield ds
-    finally:
-        ds.close()
+                ds = open_zarr_cache(cache_path)
+        try:
+            yield ds
+        finally:
+            ds.close()
 
 
 def find_file(base: Path, experiment: str, variable: str) -> Optional[Path]:
@@ -74,22 +196,22 @@ def find_file(base: Path, experiment: str, variable: str) -> Optional[Path]:
     if not folder.exists():
         return None
 
-    patterns = [
-        f"*{experiment}*{variable}*.nc",
-        f"*{variable}*{experiment}*.nc",
-        f"*{experiment}*{variable}*.zip",
-        f"*{variable}*{experiment}*.zip",
-    ]
-
-    candidates: List[Path] = []
-    for pattern in patterns:
-        candidates.extend(folder.glob(pattern))
+    # Uma única varredura do diretório, filtrando os nomes em memória.
+    with os.scandir(folder) as entries:
+        candidates = [
+            entry
+            for entry in entries
+            if experiment in entry.name
+            and variable in entry.name
+            and entry.name.endswith((".nc", ".zip"))
+            and entry.is_file()
+        ]
     if not candidates:
         return None
 
     # Escolhe o mais recente pela data de modificação.
-    candidates.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return candidates[0]
+    latest = max(candidates, key=lambda e: e.stat().st_mtime)
+    return Path(latest.path)
 
 
 def guess_lat_lon_dims(da: xr.DataArray) -> List[str]:
@@ -106,17 +228,41 @@ def guess_lat_lon_dims(da: xr.DataArray) -> List[str]:
 
 
 def spatial_mean(da: xr.DataArray) -> xr.DataArray:
-    dims = guess_lat_lon_dims(da)
-    return da.mean(dim=dims) if dims else da
+    # Usa as dimensões já anotadas em load_series, se houver.
+    dims = da.attrs.get(LATLON_DIMS_ATTR)
+    if dims is None:
+        dims = guess_lat_lon_dims(da)
+    reduced = da.mean(dim=list(dims)) if dims else da.copy(deep=False)
+    reduced.attrs.pop(LATLON_DIMS_ATTR, None)
+    return reduced
+
+
+def _resample(da: xr.DataArray, freq: str, how: str) -> xr.DataArray:
+    # A série já é 1-D após a média espacial: o resample do pandas evita o
+    # overhead de groupby do xarray. Calendários cftime (CFTimeIndex) e
+    # arrays com dimensões extras continuam no caminho do xarray.
+    index = da.indexes.get("time") if da.ndim == 1 else None
+    if not isinstance(index, pd.DatetimeIndex):
+        return getattr(da.resample(time=freq), how)("time")
+    series = getattr(da.to_series().resample(freq), how)()
+    out = xr.DataArray.from_series(series)
+    out.attrs = dict(da.attrs)
+    return out
 
 
 def annual_mean(da: xr.DataArray) -> xr.DataArray:
     # 'Y' está depreciado; usar 'YE' (year-end) para ficar alinhado ao pandas.
-    return da.resample(time="YE").mean("time")
+    return _resample(da, "YE", "mean")
 
 
 def annual_sum(da: xr.DataArray) -> xr.DataArray:
-    return da.resample(time="YE").sum("time")
+    return _resample(da, "YE", "sum")
+
+
+def annual_max(da: xr.DataArray) -> xr.DataArray:
+    # Série diária 1-D é pequena: carrega antes e reamostra no pandas, evitando
+    # o resample do xarray sobre dask seguido de .values.
+    return _resample(da.load(), "YE", "max")
 
 
 def get_agg_method(variable: str) -> str:
@@ -125,13 +271,20 @@ def get_agg_method(variable: str) -> str:
 
 def monthly_aggregate(da: xr.DataArray, method: str) -> xr.DataArray:
     if method == "sum":
-        return da.resample(time="1MS").sum("time")
-    return da.resample(time="1MS").mean("time")
+        return _resample(da, "1MS", "sum")
+    return _resample(da, "1MS", "mean")
 
 
 def monthly_climatology(da: xr.DataArray, method: str) -> xr.DataArray:
     monthly = monthly_aggregate(da, method)
-    return monthly.groupby("time.month").mean("time")
+    index = monthly.indexes.get("time") if monthly.ndim == 1 else None
+    if not isinstance(index, pd.DatetimeIndex):
+        return monthly.groupby("time.month").mean("time")
+    series = monthly.to_series()
+    clim = series.groupby(series.index.month.rename("month")).mean()
+    out = xr.DataArray.from_series(clim)
+    out.attrs = dict(monthly.attrs)
+    return out
 
 
 def annual_aggregate(da: xr.DataArray, method: str) -> xr.DataArray:
@@ -146,30 +299,47 @@ def format_label(variable: str, units: Optional[str]) -> str:
     return variable
 
 
+_FIGURE: Optional[Figure] = None
+
+
+def reuse_figure(figsize: Tuple[float, float]) -> Figure:
+    # Uma única Figure (sem pyplot) limpa e redimensionada a cada gráfico.
+    global _FIGURE
+    if _FIGURE is None:
+        _FIGURE = Figure(figsize=figsize)
+    else:
+        _FIGURE.clear()
+        _FIGURE.set_size_inches(figsize)
+    return _FIGURE
+
+
+def save_figure(fig: Figure, output: Path) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fig.tight_layout()
+    # Sem metadados extras nem passe de otimização do PNG.
+    fig.savefig(output, dpi=200, metadata={}, pil_kwargs={"optimize": False})
+
+
 def plot_monthly_climatology(clims: Dict[str, xr.DataArray], title_var: str, y_label: str, output: Path) -> None:
-    fig, ax = plt.subplots(figsize=(8, 5))
-    months = np.arange(1, 13)
+    fig = reuse_figure((8, 5))
+    ax = fig.add_subplot()
     for label, data in clims.items():
-        series = data.to_pandas()
         color = COLORS.get(label)
-        ax.plot(months, series.values, marker="o", label=label, color=color)
+        ax.plot(MONTHS, data.values, marker="o", label=label, color=color)
     ax.set_xlabel("Mês")
     ax.set_ylabel(y_label)
     ax.set_title(f"Climatologia mensal - {title_var}")
-    ax.set_xticks(months)
+    ax.set_xticks(MONTHS)
     ax.legend()
-    output.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    save_figure(fig, output)
 
 
 def plot_annual_series(series: Dict[str, xr.DataArray], means: Dict[str, float], title_var: str, y_label: str, output: Path) -> None:
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig = reuse_figure((9, 5))
+    ax = fig.add_subplot()
     for label, data in series.items():
-        s = data.to_pandas()
         color = COLORS.get(label)
-        ax.plot(s.index.year, s.values, marker="o", label=label, color=color)
+        ax.plot(data["time"].dt.year.values, data.values, marker="o", label=label, color=color)
     # Linhas horizontais das médias (histórica e cenários)
     for name, mean_val in means.items():
         color = COLORS.get(name)
@@ -178,60 +348,60 @@ def plot_annual_series(series: Dict[str, xr.DataArray], means: Dict[str, float],
     ax.set_ylabel(y_label)
     ax.set_title(f"Série anual - {title_var}")
     ax.legend()
-    output.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    save_figure(fig, output)
 
 
 def plot_monthly_anomalies(anoms: Dict[str, xr.DataArray], title_var: str, y_label: str, output: Path) -> None:
-    fig, ax = plt.subplots(figsize=(8, 5))
-    months = np.arange(1, 13)
+    fig = reuse_figure((8, 5))
+    ax = fig.add_subplot()
     for label, data in anoms.items():
-        s = data.to_pandas()
         color = COLORS.get(label)
-        ax.plot(months, s.values, marker="o", label=label, color=color)
+        ax.plot(MONTHS, data.values, marker="o", label=label, color=color)
     ax.axhline(0, color="gray", linewidth=1)
     ax.set_xlabel("Mês")
     ax.set_ylabel(y_label)
     ax.set_title(f"Anomalia mensal vs. histórico - {title_var}")
-    ax.set_xticks(months)
+    ax.set_xticks(MONTHS)
     ax.legend()
-    output.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    save_figure(fig, output)
 
 
 def plot_annual_anomalies(anoms: Dict[str, xr.DataArray], title_var: str, y_label: str, output: Path) -> None:
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig = reuse_figure((9, 5))
+    ax = fig.add_subplot()
     for label, data in anoms.items():
-        s = data.to_pandas()
         color = COLORS.get(label)
-        ax.plot(s.index.year, s.values, marker="o", label=label, color=color)
+        ax.plot(data["time"].dt.year.values, data.values, marker="o", label=label, color=color)
     ax.axhline(0, color="gray", linewidth=1, linestyle="--")
     ax.set_xlabel("Ano")
     ax.set_ylabel(y_label)
     ax.set_title(f"Anomalia anual vs. média histórica - {title_var}")
     ax.legend()
-    output.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    save_figure(fig, output)
 
 
-def load_wind_direction(path: Path) -> Optional[xr.DataArray]:
-    with open_dataset_maybe_zip(path) as ds:
-        u_name = next((n for n in WIND_U_ALIASES if n in ds), None)
-        v_name = next((n for n in WIND_V_ALIASES if n in ds), None)
-        if not u_name or not v_name:
-            return None
-        u = spatial_mean(ds[u_name]).sortby("time").load()
-        v = spatial_mean(ds[v_name]).sortby("time").load()
-        direction = (np.degrees(np.arctan2(-u, -v)) + 360) % 360  # direção de onde o vento sopra
-        direction.name = "wind_direction"
-        direction.attrs["units"] = "degrees_from_north"
-        return direction
+def load_wind_components(ds: xr.Dataset) -> Optional[xr.Dataset]:
+    u_name = next((n for n in WIND_U_ALIASES if n in ds), None)
+    v_name = next((n for n in WIND_V_ALIASES if n in ds), None)
+    if not u_name or not v_name:
+        return None
+    # u e v no mesmo grafo: uma única leitura/compute para as duas componentes.
+    subset = ds[[u_name, v_name]]
+    dims = guess_lat_lon_dims(subset[u_name])
+    if dims:
+        subset = subset.mean(dim=dims)
+    subset = subset.sortby("time").load()
+    return subset.rename({u_name: "u", v_name: "v"})
+
+
+def wind_direction(components: Optional[xr.Dataset]) -> Optional[xr.DataArray]:
+    if components is None:
+        return None
+    u, v = components["u"], components["v"]
+    direction = (np.degrees(np.arctan2(-u, -v)) + 360) % 360  # direção de onde o vento sopra
+    direction.name = "wind_direction"
+    direction.attrs["units"] = "degrees_from_north"
+    return direction
 
 
 def plot_wind_rose(directions: Dict[str, xr.DataArray], output: Path) -> None:
@@ -240,26 +410,29 @@ def plot_wind_rose(directions: Dict[str, xr.DataArray], output: Path) -> None:
         print("[aviso] Rosa dos ventos ignorada: componentes de vento (u/v) não encontrados.")
         return
     n = len(valid)
-    fig, axes = plt.subplots(1, n, subplot_kw={"projection": "polar"}, figsize=(4 * n, 4))
-    if n == 1:
-        axes = [axes]
-    bins = np.deg2rad(np.linspace(0, 360, 17))
-    for ax, (label, direction) in zip(axes, valid.items()):
-        angles = np.deg2rad(direction.values)
-        angles = angles[~np.isnan(angles)]
-        if angles.size == 0:
+    fig = reuse_figure((4 * n, 4))
+    axes = [fig.add_subplot(1, n, i + 1, projection="polar") for i in range(n)]
+    bins = np.deg2rad(np.linspace(0, 360, N_DIRECTION_BINS + 1))
+    lefts, widths = bins[:-1], np.diff(bins)
+    # Contagem de todos os cenários num único bincount: índice = cenário * 16 + setor.
+    angles = [np.deg2rad(direction.values).ravel() for direction in valid.values()]
+    labels = np.repeat(np.arange(n), [a.size for a in angles])
+    all_angles = np.concatenate(angles)
+    finite = np.isfinite(all_angles)
+    sectors = (all_angles[finite] * (N_DIRECTION_BINS / (2 * np.pi))).astype(np.int32) % N_DIRECTION_BINS
+    flat = labels[finite] * N_DIRECTION_BINS + sectors
+    counts = np.bincount(flat, minlength=n * N_DIRECTION_BINS).reshape(n, N_DIRECTION_BINS)
+    for ax, label, row in zip(axes, valid.keys(), counts):
+        total = row.sum()
+        if total == 0:
             continue
-        counts, _ = np.histogram(angles, bins=bins)
-        freq = counts / counts.sum() * 100.0
-        ax.bar(bins[:-1], freq, width=np.diff(bins), align="edge", color=COLORS.get(label), edgecolor="k", alpha=0.7)
+        freq = row / total * 100.0
+        ax.bar(lefts, freq, width=widths, align="edge", color=COLORS.get(label), edgecolor="k", alpha=0.7)
         ax.set_theta_zero_location("N")
         ax.set_theta_direction(-1)  # sentido horário
         ax.set_title(f"Rosa dos ventos - {label}")
         ax.set_yticklabels([])
-    output.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    save_figure(fig, output)
 
 
 def compute_return_levels(data: xr.DataArray, periods: List[int]) -> Dict[int, float]:
@@ -268,20 +441,23 @@ def compute_return_levels(data: xr.DataArray, periods: List[int]) -> Dict[int, f
     except ImportError as exc:
         raise ImportError("scipy é necessário para cálculo de período de retorno.") from exc
 
-    values = data.values
+    values = np.asarray(data.values, dtype=float)
     values = values[np.isfinite(values)]
     if values.size < 5:
         raise ValueError("Série muito curta para estimar extremos.")
-    shape, loc, scale = genextreme.fit(values)
-    levels = {p: float(genextreme.ppf(1 - 1 / p, shape, loc=loc, scale=scale)) for p in periods}
-    return levels
+    # Média/desvio como ponto de partida do MLE (não fixam loc/scale).
+    shape, loc, scale = genextreme.fit(values, loc=values.mean(), scale=values.std())
+    probs = 1 - 1.0 / np.asarray(periods, dtype=float)
+    quantiles = genextreme.ppf(probs, shape, loc=loc, scale=scale)
+    return dict(zip(periods, quantiles.tolist()))
 
 
 def plot_return_levels(levels: Dict[str, Dict[int, float]], periods: List[int], title_var: str, y_label: str, output: Path) -> None:
     if not levels:
         print("[aviso] Nenhum nível de retorno calculado.")
         return
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = reuse_figure((8, 5))
+    ax = fig.add_subplot()
     periods_sorted = sorted(periods)
     for label, lvls in levels.items():
         y = [lvls[p] for p in periods_sorted if p in lvls]
@@ -292,10 +468,7 @@ def plot_return_levels(levels: Dict[str, Dict[int, float]], periods: List[int],
     ax.set_ylabel(y_label)
     ax.set_title(f"Níveis de retorno - {title_var}")
     ax.legend()
-    output.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output, dpi=200)
-    plt.close(fig)
+    save_figure(fig, output)
 
 
 def parse_scenario_files(pairs: Iterable[str]) -> Dict[str, Path]:
@@ -352,34 +525,47 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def series_from_dataset(ds: xr.Dataset, path: Path, variable: str) -> xr.DataArray:
+    target_var = variable
+    if target_var not in ds:
+        # Tenta aliases comuns (ex.: near_surface_air_temperature -> tas)
+        for alias in ALIASES.get(variable, []):
+            if alias in ds:
+                target_var = alias
+                break
+    if target_var not in ds:
+        # Se há apenas uma variável de dados, use-a.
+        data_vars = list(ds.data_vars)
+        if len(data_vars) == 1:
+            target_var = data_vars[0]
+        else:
+            raise KeyError(
+                f"Variável {variable} não encontrada em {path.name}. Disponíveis: {', '.join(data_vars)}"
+            )
+
+    da = ds[target_var].copy(deep=False)  # attrs próprios, sem alterar o Dataset
+    da.attrs[LATLON_DIMS_ATTR] = tuple(guess_lat_lon_dims(da))
+    da = spatial_mean(da)  # ainda preguiçoso: só o grafo da média
+    # Converte temperatura de K para °C quando aplicável.
+    if variable in TEMP_NAMES or target_var in TEMP_NAMES:
+        units = str(da.attrs.get("units", "")).lower()
+        if "k" in units or units in {"kelvin", "k"}:
+            da = da - 273.15
+            da.attrs["units"] = "degC"
+    # Materializa apenas a série 1-D já reduzida, não o cubo tempo x lat x lon.
+    da = da.sortby("time").compute()
+    return da
+
+
 def load_series(path: Path, variable: str) -> xr.DataArray:
     with open_dataset_maybe_zip(path) as ds:
-        target_var = variable
-        if target_var not in ds:
-            # Tenta aliases comuns (ex.: near_surface_air_temperature -> tas)
-            for alias in ALIASES.get(variable, []):
-                if alias in ds:
-                    target_var = alias
-                    break
-        if target_var not in ds:
-            # Se há apenas uma variável de dados, use-a.
-            data_vars = list(ds.data_vars)
-            if len(data_vars) == 1:
-                target_var = data_vars[0]
-            else:
-                raise KeyError(
-                    f"Variável {variable} não encontrada em {path.name}. Disponíveis: {', '.join(data_vars)}"
-                )
+        return series_from_dataset(ds, path, variable)
+
 
-        da = spatial_mean(ds[target_var])
-        # Converte temperatura de K para °C quando aplicável.
-        if variable in TEMP_NAMES or target_var in TEMP_NAMES:
-            units = str(da.attrs.get("units", "")).lower()
-            if "k" in units or units in {"kelvin", "k"}:
-                da = da - 273.15
-                da.attrs["units"] = "degC"
-        da = da.sortby("time").load()  # carrega em memória para independência do arquivo
-        return da
+def load_series_with_wind(path: Path, variable: str) -> Tuple[xr.DataArray, Optional[xr.Dataset]]:
+    # Velocidade e componentes u/v numa única abertura do arquivo.
+    with open_dataset_maybe_zip(path) as ds:
+        return series_from_dataset(ds, path, variable), load_wind_components(ds)
 
 
 def main() -> None:
@@ -390,7 +576,13 @@ def main() -> None:
     if hist_path is None:
         raise FileNotFoundError("Arquivo histórico não encontrado. Use --historical-file ou baixe em date/historico.")
 
-    hist_series = load_series(hist_path, args.variable)
+    is_wind = args.variable in WIND_SPEED_NAMES
+    # Para vento, u/v saem da mesma abertura do arquivo da velocidade.
+    wind_components: Dict[str, Optional[xr.Dataset]] = {}
+    if is_wind:
+        hist_series, wind_components["historical"] = load_series_with_wind(hist_path, args.variable)
+    else:
+        hist_series = load_series(hist_path, args.variable)
     units = str(hist_series.attrs.get("units", "")).strip() or None
     y_label = format_label(args.variable, units)
     agg_method = get_agg_method(args.variable)
@@ -398,13 +590,25 @@ def main() -> None:
     hist_clim = monthly_climatology(hist_series, agg_method)
     hist_annual = annual_aggregate(hist_series, agg_method)
 
-    scenario_series: Dict[str, xr.DataArray] = {}
+    scenario_paths: Dict[str, Path] = {}
     for experiment in args.experiments:
         path = scenario_map.get(experiment) or find_file(args.data_dir, experiment, args.variable)
         if path is None:
             print(f"[aviso] Arquivo não encontrado para {experiment}. Pulei.")
             continue
-        scenario_series[experiment] = load_series(path, args.variable)
+        scenario_paths[experiment] = path
+
+    # Cenários são independentes e a leitura é dominada por I/O: abre em paralelo.
+    scenario_series: Dict[str, xr.DataArray] = {}
+    if scenario_paths:
+        loader = load_series_with_wind if is_wind else load_series
+        with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(scenario_paths))) as executor:
+            futures = {name: executor.submit(loader, path, args.variable) for name, path in scenario_paths.items()}
+        for experiment, future in futures.items():
+            if is_wind:
+                scenario_series[experiment], wind_components[experiment] = future.result()
+            else:
+                scenario_series[experiment] = future.result()
 
     if not scenario_series:
         raise FileNotFoundError("Nenhum arquivo de cenário encontrado.")
@@ -413,29 +617,24 @@ def main() -> None:
     monthly_anoms = {k: clim - hist_clim for k, clim in scenario_clims.items()}
     scenario_annual = {k: annual_aggregate(v, agg_method) for k, v in scenario_series.items()}
     annual_series = {"historical": hist_annual, **scenario_annual}
-    annual_means = {name: float(arr.mean().values) for name, arr in annual_series.items()}
+    # Uma única redução para todas as séries (eixos de tempo distintos viram NaN e são ignorados).
+    stacked = xr.concat(list(annual_series.values()), dim=pd.Index(list(annual_series), name="label"), join="outer")
+    annual_means = dict(zip(annual_series, stacked.mean("time").compute().values.tolist()))
 
     # Anomalia anual (cenários vs média histórica, não acumulada)
     hist_mean_scalar = annual_means["historical"]
-    annual_anoms = {name: (arr - hist_mean_scalar) for name, arr in scenario_annual.items()}
-
-    # Rosa dos ventos (se dados de direção estiverem disponíveis)
-    wind_dirs: Dict[str, Optional[xr.DataArray]] = {}
-    if args.variable in WIND_SPEED_NAMES:
-        wind_dirs["historical"] = load_wind_direction(hist_path)
-        for experiment in scenario_series.keys():
-            path = scenario_map.get(experiment) or find_file(args.data_dir, experiment, args.variable)
-            wind_dirs[experiment] = load_wind_direction(path) if path else None
+    # Subtração direto nos arrays numpy, reaproveitando as coordenadas de cada série.
+    annual_anoms = {
+        name: arr.copy(deep=False, data=np.subtract(arr.to_numpy(), hist_mean_scalar))
+        for name, arr in scenario_annual.items()
+    }
 
     # Extremos de vento: níveis de retorno
     return_levels: Dict[str, Dict[int, float]] = {}
-    if args.variable in WIND_SPEED_NAMES:
+    if is_wind:
         try:
-            hist_max = annual_max(hist_series)
-            return_levels["historical"] = compute_return_levels(hist_max, args.return_periods)
-            for name, series in scenario_series.items():
-                scen_max = annual_max(series)
-                return_levels[name] = compute_return_levels(scen_max, args.return_periods)
+            for name, series in {"historical": hist_series, **scenario_series}.items():
+                return_levels[name] = compute_return_levels(annual_max(series), args.return_periods)
         except Exception as exc:  # captura erros de ajuste ou série curta
             print(f"[aviso] Não foi possível calcular níveis de retorno: {exc}")
 
@@ -444,7 +643,9 @@ def main() -> None:
     plot_annual_series(annual_series, annual_means, args.variable, y_label, output_dir / f"{args.variable}_serie_anual.png")
     plot_monthly_anomalies(monthly_anoms, args.variable, f"Anomalia de {y_label}", output_dir / f"{args.variable}_anomalias_mensais.png")
     plot_annual_anomalies(annual_anoms, args.variable, f"Anomalia anual de {y_label}", output_dir / f"{args.variable}_anomalias_anuais.png")
-    if args.variable in WIND_SPEED_NAMES:
+    if is_wind:
+        # Direção calculada só aqui, a partir das componentes já carregadas.
+        wind_dirs = {name: wind_direction(comp) for name, comp in wind_components.items()}
         plot_wind_rose(wind_dirs, output_dir / f"{args.variable}_rosa_dos_ventos.png")
         plot_return_levels(return_levels, args.return_periods, args.variable, y_label, output_dir / f"{args.variable}_niveis_retorno.png")
 